@@ -0,0 +1,15 @@
+import pandas as pd
+
+# One-time conversion of the source CSVs to Parquet so part3.py can skip CSV parsing.
+pd.read_csv('2023-2024 NBA Player Stats - Regular.csv', sep=';', encoding='latin1',
+            usecols=['Player', 'Tm', 'MP', 'PTS', 'FG%', 'AST'],
+            dtype={'MP': 'float32', 'PTS': 'float32', 'FG%': 'float32', 'AST': 'float32',
+                   'Player': 'string', 'Tm': 'category'},
+            engine='c').to_parquet(
+    'nba_players.parquet', engine='pyarrow', compression='snappy')
+
+pd.read_csv('NBA Stats 202324 Team Metrics Away-Home-Last 5 Splits-2.csv').to_parquet(
+    'team_metrics_actual.parquet', engine='pyarrow', compression='snappy')
+
+pd.read_csv('Teams_Estimated_Metrics_Season23_24.csv').to_parquet(
+    'team_metrics_expected.parquet', engine='pyarrow', compression='snappy')
@@ -1,6 +1,120 @@
 import streamlit as st
 import pandas as pd
-import altair as alt
+import numpy as np
+
+# Vega-Lite specs are plain dicts so no Altair object graph is rebuilt on each rerun;
+# st.vega_lite_chart attaches the DataFrame passed alongside as the chart data.
+PLAYER_CHART_SPEC = {
+    'mark': 'circle',
+    'encoding': {
+        'x': {'field': 'MP', 'type': 'quantitative',
+              'title': 'Minutes Played per Game',
+              'scale': {'zero': False}},
+        'y': {'field': 'PTS', 'type': 'quantitative',
+              'title': 'Points per Game',
+              'scale': {'zero': False}},
+        'color': {'field': 'FG%', 'type': 'quantitative',
+                  'title': 'Field Goal %',
+                  'scale': {'scheme': 'viridis'}},
+        'size': {'field': 'AST', 'type': 'quantitative',
+                 'title': 'Assists per Game',
+                 'scale': {'range': [50, 400]}},
+        'tooltip': [
+            {'field': 'Player', 'type': 'nominal', 'title': 'Player'},
+            {'field': 'Tm', 'type': 'nominal', 'title': 'Team'},
+            {'field': 'MP', 'type': 'quantitative', 'title': 'Minutes', 'format': '.1f'},
+            {'field': 'PTS', 'type': 'quantitative', 'title': 'Points', 'format': '.1f'},
+            {'field': 'FG%', 'type': 'quantitative', 'title': 'FG%', 'format': '.1%'},
+            {'field': 'AST', 'type': 'quantitative', 'title': 'Assists', 'format': '.1f'}
+        ]
+    },
+    # The minutes filter runs in the browser, so dragging the slider never reruns the script
+    'params': [{'name': 'grid',
+                'select': {'type': 'interval', 'encodings': ['x', 'y']},
+                'bind': 'scales'},
+               {'name': 'min_minutes',
+                'value': 10,
+                'bind': {'input': 'range', 'min': 0, 'max': 37, 'step': 1,
+                         'name': 'Minimum Minutes Played per Game '}}],
+    'transform': [{'filter': 'datum.MP >= min_minutes'}],
+    'width': 700,
+    'height': 500
+}
+
+COMPARISON_CHART_SPEC = {
+    'layer': [
+        {
+            'mark': {'type': 'circle', 'size': 100},
+            'encoding': {
+                'x': {'field': 'Expected_Win_PCT', 'type': 'quantitative',
+                      'title': 'Preseason Expected Win %',
+                      'scale': {'domain': [0, 1]}},
+                'y': {'field': 'Actual_Win_PCT', 'type': 'quantitative',
+                      'title': 'Current Win %',
+                      'scale': {'domain': [0, 1]}},
+                'color': {'field': 'Conference', 'type': 'nominal',
+                          'scale': {'domain': ['East', 'West'],
+                                    'range': ['#C41E3A', '#1D428A']}},  # NBA official colors
+                'tooltip': [
+                    {'field': 'Team', 'type': 'nominal'},
+                    {'field': 'Expected_Win_PCT', 'type': 'quantitative'},
+                    {'field': 'Actual_Win_PCT', 'type': 'quantitative'}
+                ]
+            }
+        },
+        {
+            'data': {'values': [{'x': 0, 'y': 0}, {'x': 1, 'y': 1}]},
+            'mark': {'type': 'line', 'strokeDash': [5, 5], 'color': 'gray', 'opacity': 0.5},
+            'encoding': {
+                'x': {'field': 'x', 'type': 'quantitative'},
+                'y': {'field': 'y', 'type': 'quantitative'}
+            }
+        }
+    ],
+    'width': 600,
+    'height': 400
+}
+
+PERFORMANCE_CHART_SPEC = {
+    # Both layers read the same data; only rows with a label draw text
+    'layer': [
+        {
+            'mark': 'circle',
+            'encoding': {
+                'x': {'field': 'PACE', 'type': 'quantitative',
+                      'title': 'Pace (Possessions per 48 minutes)',
+                      'scale': {'zero': False}},
+                'y': {'field': 'PPG', 'type': 'quantitative',
+                      'title': 'Points Per Game',
+                      'scale': {'zero': False}},
+                'size': {'field': 'defense_size', 'type': 'quantitative',
+                         'title': 'Defensive Rating',
+                         'legend': {'title': 'Defense Quality'}},
+                'color': {'field': 'CONF', 'type': 'nominal',
+                          'scale': {'domain': ['East', 'West'],
+                                    'range': ['#C41E3A', '#1D428A']}},
+                'tooltip': [
+                    {'field': 'TEAM', 'type': 'nominal'},
+                    {'field': 'PPG', 'type': 'quantitative', 'title': 'Points Per Game', 'format': '.1f'},
+                    {'field': 'PACE', 'type': 'quantitative', 'title': 'Pace', 'format': '.1f'},
+                    {'field': 'dEFF', 'type': 'quantitative', 'title': 'Defensive Rating', 'format': '.1f'},
+                    {'field': 'WIN%', 'type': 'quantitative', 'title': 'Win %', 'format': '.3f'}
+                ]
+            }
+        },
+        {
+            'transform': [{'filter': "datum.label != ''"}],
+            'mark': {'type': 'text', 'align': 'left', 'baseline': 'middle', 'dx': 5},
+            'encoding': {
+                'x': {'field': 'PACE', 'type': 'quantitative'},
+                'y': {'field': 'PPG', 'type': 'quantitative'},
+                'text': {'field': 'label', 'type': 'nominal'}
+            }
+        }
+    ],
+    'width': 600,
+    'height': 400
+}
 
 st.markdown("# NBA Player Performance Analysis: Understanding the Modern Game")
 st.markdown("### By: Max Zhang, Zhuokai Wu, Jimmy Qiu")
@@ -13,18 +127,102 @@ a casual fan or a basketball enthusiast, this analysis will help you understand
 certain players stand out and how different playing styles impact the game.
 """)
 
-@st.cache_data  
+# Loaders use cache_resource so every rerun shares one frame without hashing or copying it.
+# Treat the returned DataFrames as read-only; filter into new frames instead of mutating them.
+@st.cache_resource
 def load_data():
-    df = pd.read_csv('2023-2024 NBA Player Stats - Regular.csv', sep=';', encoding='latin1')
+    df = pd.read_parquet('nba_players.parquet',
+                         columns=['Player', 'Tm', 'MP', 'PTS', 'FG%', 'AST'],
+                         engine='pyarrow')
     
-    tot_players = df[df['Tm'] == 'TOT']['Player'].unique()
-    clean_df = df[
-        (df['Tm'] == 'TOT') |  
-        (~df['Player'].isin(tot_players))  
-    ]
-    return clean_df
-
-df = load_data()
+    # Keep a player's TOT row if they have one, otherwise their single team row
+    is_tot = (df['Tm'] == 'TOT').to_numpy()
+    has_tot = df['Player'].isin(df.loc[is_tot, 'Player']).to_numpy()
+    clean_df = df[is_tot | ~has_tot]
+    team_list = sorted(clean_df['Tm'].unique().tolist())
+    return clean_df, team_list
+
+# Full franchise names in the estimates file -> short names used by the team splits file
+TEAM_SHORT_NAMES = {
+    'Atlanta Hawks': 'Atlanta',
+    'Boston Celtics': 'Boston',
+    'Brooklyn Nets': 'Brooklyn',
+    'Charlotte Hornets': 'Charlotte',
+    'Chicago Bulls': 'Chicago',
+    'Cleveland Cavaliers': 'Cleveland',
+    'Dallas Mavericks': 'Dallas',
+    'Denver Nuggets': 'Denver',
+    'Detroit Pistons': 'Detroit',
+    'Golden State Warriors': 'Golden State',
+    'Houston Rockets': 'Houston',
+    'Indiana Pacers': 'Indiana',
+    'LA Clippers': 'LA Clippers',
+    'Los Angeles Lakers': 'LA Lakers',
+    'Memphis Grizzlies': 'Memphis',
+    'Miami Heat': 'Miami',
+    'Milwaukee Bucks': 'Milwaukee',
+    'Minnesota Timberwolves': 'Minnesota',
+    'New Orleans Pelicans': 'New Orleans',
+    'New York Knicks': 'New York',
+    'Oklahoma City Thunder': 'Oklahoma City',
+    'Orlando Magic': 'Orlando',
+    'Philadelphia 76ers': 'Philadelphia',
+    'Phoenix Suns': 'Phoenix',
+    'Portland Trail Blazers': 'Portland',
+    'Sacramento Kings': 'Sacramento',
+    'San Antonio Spurs': 'San Antonio',
+    'Toronto Raptors': 'Toronto',
+    'Utah Jazz': 'Utah',
+    'Washington Wizards': 'Washington'
+}
+
+@st.cache_resource
+def load_team_data():
+    actual = pd.read_parquet('team_metrics_actual.parquet',
+                             columns=['TEAM', 'CONF', 'PPG', 'PACE', 'dEFF', 'WIN%'],
+                             engine='pyarrow')
+    expected = pd.read_parquet('team_metrics_expected.parquet',
+                               columns=['TEAM_NAME', 'W_PCT'],
+                               engine='pyarrow')
+
+    actual['TEAM'] = actual['TEAM'].str.strip()
+    expected['TEAM'] = expected['TEAM_NAME'].str.strip().map(TEAM_SHORT_NAMES)
+
+    # The two files list teams in different orders, so pair rows by team name
+    merged = actual.merge(expected[['TEAM', 'W_PCT']], on='TEAM', how='inner',
+                          validate='one_to_one')
+    comparison_data = merged[['TEAM', 'WIN%', 'W_PCT', 'CONF']].rename(
+        columns={'TEAM': 'Team', 'WIN%': 'Actual_Win_PCT',
+                 'W_PCT': 'Expected_Win_PCT', 'CONF': 'Conference'}
+    )
+
+    actual['defense_size'] = (actual['dEFF'].max() - actual['dEFF']).astype('float32')
+
+    # Label the top scoring and fastest paced teams on the performance chart
+    notable = actual.nlargest(3, 'PPG').index.union(actual.nlargest(3, 'PACE').index)
+    actual['label'] = ''
+    actual.loc[notable, 'label'] = actual.loc[notable, 'TEAM']
+    return actual, comparison_data
+
+# Keyed on the selected teams, so reruns with unchanged filters reuse the same frame
+@st.cache_resource(max_entries=64)
+def filter_players(teams):
+    df, _ = load_data()
+    filtered_df = df
+    if teams:
+        # Tm is categorical, so look teams up by integer code instead of hashing strings
+        tm = df['Tm'].cat
+        is_selected = np.zeros(len(tm.categories), dtype=bool)
+        is_selected[tm.categories.get_indexer(teams)] = True
+        filtered_df = df.iloc[is_selected[tm.codes.to_numpy()]]
+
+    # Cap the points sent to the browser; overlapping circles beyond this are indistinguishable
+    if len(filtered_df) > 1000:
+        filtered_df = filtered_df.sample(n=1000, random_state=0)
+    return filtered_df
+
+df, team_list = load_data()
+actual, comparison_data = load_team_data()
 
 st.markdown("## Exploring Player Performance")
 st.markdown("""
@@ -33,44 +231,15 @@ allows you to see how minutes played, scoring, and shooting efficiency relate to
 across the league.
 """)
 
-min_minutes = st.slider("Minimum Minutes Played per Game", 0, 37, 10)
 selected_teams = st.multiselect(
     "Choose your favorite team! (Default: All teams)",
-    options=sorted(df['Tm'].unique()),
+    options=team_list,
     default=[]
 )
 
-filtered_df = df[df['MP'] >= min_minutes]
-if selected_teams:
-    filtered_df = filtered_df[filtered_df['Tm'].isin(selected_teams)]
-
-chart = alt.Chart(filtered_df).mark_circle().encode(
-    x=alt.X('MP:Q', 
-            title='Minutes Played per Game',
-            scale=alt.Scale(zero=False)),
-    y=alt.Y('PTS:Q', 
-            title='Points per Game',
-            scale=alt.Scale(zero=False)),
-    color=alt.Color('FG%:Q', 
-                   title='Field Goal %',
-                   scale=alt.Scale(scheme='viridis')),
-    size=alt.Size('AST:Q', 
-                 title='Assists per Game',
-                 scale=alt.Scale(range=[50, 400])),
-    tooltip=[
-        alt.Tooltip('Player:N', title='Player'),
-        alt.Tooltip('Tm:N', title='Team'),
-        alt.Tooltip('MP:Q', title='Minutes', format='.1f'),
-        alt.Tooltip('PTS:Q', title='Points', format='.1f'),
-        alt.Tooltip('FG%:Q', title='FG%', format='.1%'),
-        alt.Tooltip('AST:Q', title='Assists', format='.1f')
-    ]
-).properties(
-    width=700,
-    height=500
-).interactive()
-
-st.altair_chart(chart, use_container_width=True)
+filtered_df = filter_players(tuple(selected_teams))
+
+st.vega_lite_chart(filtered_df, PLAYER_CHART_SPEC, use_container_width=True)
 
 st.markdown("""
 ### Understanding the Visualization
@@ -94,42 +263,7 @@ st.markdown("""
 Before every NBA season, analysts make predictions about team performance. Let's see if teams are living up to the hype. In the plot below, hover above any point to see team name and the predicted vs. actual winrates.
 """)
 
-actual = pd.read_csv('NBA Stats 202324 Team Metrics Away-Home-Last 5 Splits-2.csv')
-expected = pd.read_csv('Teams_Estimated_Metrics_Season23_24.csv')
-
-actual['TEAM'] = actual['TEAM'].str.strip()
-expected['TEAM_NAME'] = expected['TEAM_NAME'].str.strip()
-
-comparison_data = pd.DataFrame({
-    'Team': actual['TEAM'],
-    'Actual_Win_PCT': actual['WIN%'],
-    'Expected_Win_PCT': expected['W_PCT'],
-    'Conference': actual['CONF']
-})
-
-comparison_chart = alt.Chart(comparison_data).mark_circle(size=100).encode(
-    x=alt.X('Expected_Win_PCT:Q', 
-            title='Preseason Expected Win %',
-            scale=alt.Scale(domain=[0, 1])),
-    y=alt.Y('Actual_Win_PCT:Q', 
-            title='Current Win %',
-            scale=alt.Scale(domain=[0, 1])),
-    color=alt.Color('Conference:N', 
-                   scale=alt.Scale(domain=['East', 'West'],
-                                 range=['#C41E3A', '#1D428A'])),  # NBA official colors
-    tooltip=['Team', 'Expected_Win_PCT:Q', 'Actual_Win_PCT:Q']
-).properties(
-    width=600,
-    height=400
-)
-
-diagonal = alt.Chart(pd.DataFrame({'x': [0, 1], 'y': [0, 1]})).mark_line(
-    strokeDash=[5, 5],
-    color='gray',
-    opacity=0.5
-).encode(x='x', y='y')
-
-st.altair_chart(comparison_chart + diagonal, use_container_width=True)
+st.vega_lite_chart(comparison_data, COMPARISON_CHART_SPEC, use_container_width=True)
 
 st.markdown("""
 Looking at how NBA teams are performing compared to preseason predictions tells us an interesting story 
@@ -149,48 +283,7 @@ and pace, with defensive rating indicated by point size. Teams above the middle
 higher scoring, while teams further right play at a faster pace. Larger circles indicate better defense.
 """)
 
-actual['defense_size'] = actual['dEFF'].max() - actual['dEFF']
-
-performance_chart = alt.Chart(actual).mark_circle().encode(
-    x=alt.X('PACE:Q', 
-            title='Pace (Possessions per 48 minutes)',
-            scale=alt.Scale(zero=False)),
-    y=alt.Y('PPG:Q', 
-            title='Points Per Game',
-            scale=alt.Scale(zero=False)),
-    size=alt.Size('defense_size:Q', 
-                 title='Defensive Rating',
-                 legend=alt.Legend(title="Defense Quality")),
-    color=alt.Color('CONF:N',
-                   scale=alt.Scale(domain=['East', 'West'],
-                                 range=['#C41E3A', '#1D428A'])),
-    tooltip=['TEAM', 
-            alt.Tooltip('PPG:Q', title='Points Per Game', format='.1f'),
-            alt.Tooltip('PACE:Q', title='Pace', format='.1f'),
-            alt.Tooltip('dEFF:Q', title='Defensive Rating', format='.1f'),
-            alt.Tooltip('WIN%:Q', title='Win %', format='.3f')]
-).properties(
-    width=600,
-    height=400
-)
-
-
-notable_teams = pd.concat([
-    actual.nlargest(3, 'PPG'),
-    actual.nlargest(3, 'PACE')
-]).drop_duplicates()
-
-text = alt.Chart(notable_teams).mark_text(
-    align='left',
-    baseline='middle',
-    dx=5
-).encode(
-    x='PACE:Q',
-    y='PPG:Q',
-    text='TEAM:N'
-)
-
-st.altair_chart(performance_chart + text, use_container_width=True)
+st.vega_lite_chart(actual, PERFORMANCE_CHART_SPEC, use_container_width=True)
 
 st.markdown("""
 The way teams score points in the NBA can tell us a lot about their playing style and strategy. 